@@ -2,20 +2,18 @@ import pygame
 import sys
 import random
 import math
-import os
 import pygame.font
 import json
 from datetime import datetime
 import time
 
 from scripts.displayManager import DisplayManager
-from scripts.entities import PhysicsEntity, Player, Enemy
-from scripts.utils import load_image, load_images, Animation
+from scripts.entities import PhysicsEntity, Player, Enemy, enemy_speeds
+from scripts.utils import load_image, load_images, list_levels, Animation
 from scripts.tilemap import Tilemap
 from scripts.clouds import Clouds
 from scripts.particle import Particle
 from scripts.spark import Spark 
-from scripts.button import Button
 from scripts.timer import Timer
 from scripts.settings import settings
 from scripts.collectableManager import CollectableManager
@@ -24,6 +22,19 @@ from scripts.keyboardManager import KeyboardManager
 from scripts.effects import Effects
 from menu import Menu
 
+# Mix level of each sound effect, scaled by the sound volume setting
+SFX_VOLUMES = {
+    'ambience': 0.2,
+    'shoot': 0.4,
+    'hit': 0.8,
+    'dash': 0.1,
+    'jump': 0.7,
+    'collect': 0.4,
+}
+
+# Decoded once per process; Menu.play builds a new Game for every round
+_sfx_cache = {}
+
 class Game:
     def __init__(self):
         
@@ -36,7 +47,13 @@ class Game:
         self.WIN_H = dm.WIN_H
 
         pygame.display.set_caption("Ninja Game")
-        self.screen = pygame.display.set_mode((self.WIN_W, self.WIN_H))
+        # Reuse the menu's window when it already has the right size,
+        # recreating it would also drop its SCALED/vsync flags
+        self.screen = pygame.display.get_surface()
+        if self.screen is None or self.screen.get_size() != (self.WIN_W, self.WIN_H):
+            self.screen = pygame.display.set_mode((self.WIN_W, self.WIN_H))
+        # Also when started without the menu; mouse input is polled, not read from events
+        pygame.event.set_blocked((pygame.MOUSEMOTION, pygame.JOYAXISMOTION))
 
         self.display = pygame.Surface((self.BASE_W, self.BASE_H), pygame.SRCALPHA)
         self.display_2 = pygame.Surface((self.BASE_W, self.BASE_H))
@@ -76,16 +93,14 @@ class Game:
             'gun': load_image('gun.png'),
             'projectile': load_image('projectile.png'),
         }
+        # Left-facing copies of the frames above, filled in as entities render
+        self.mirrored = {}
 
         # Load sound effects and set volume based on settings
-        self.sfx = {
-            'jump': pygame.mixer.Sound('data/sfx/jump.wav'),
-            'dash': pygame.mixer.Sound('data/sfx/dash.wav'),
-            'hit': pygame.mixer.Sound('data/sfx/hit.wav'),
-            'shoot': pygame.mixer.Sound('data/sfx/shoot.wav'),
-            'ambience': pygame.mixer.Sound('data/sfx/ambience.wav'),
-            'collect': pygame.mixer.Sound('data/sfx/collect.wav'),
-        }
+        if not _sfx_cache:
+            for name in SFX_VOLUMES:
+                _sfx_cache[name] = pygame.mixer.Sound('data/sfx/' + name + '.wav')
+        self.sfx = _sfx_cache
 
         self.update_sound_volumes()
 
@@ -95,6 +110,8 @@ class Game:
         
         # Global variables
         self.level = settings.selected_level
+        # Maps don't change while playing, so scan the directory once
+        self.levels = list_levels()
         self.screenshake = 0
         self.timer = Timer(self.level)
 
@@ -124,12 +141,8 @@ class Game:
 
     # Update sound volumes based on settings
     def update_sound_volumes(self):
-        self.sfx['ambience'].set_volume(settings.sound_volume * 0.2)
-        self.sfx['shoot'].set_volume(settings.sound_volume * 0.4)
-        self.sfx['hit'].set_volume(settings.sound_volume * 0.8)
-        self.sfx['dash'].set_volume(settings.sound_volume * 0.1)
-        self.sfx['jump'].set_volume(settings.sound_volume * 0.7)
-        self.sfx['collect'].set_volume(settings.sound_volume * 0.4)
+        for name, level in SFX_VOLUMES.items():
+            self.sfx[name].set_volume(settings.sound_volume * level)
 
     def load_level(self, map_id, lifes=3, respawn=False):
         self.timer.reset()
@@ -201,8 +214,6 @@ class Game:
 
 
         while self.running:
-            self.cm.load_collectables()
-
             while not self.paused:
 
                 ##### START performance tracking
@@ -216,16 +227,14 @@ class Game:
 
                 #### START COMPUTE GAME FLAGS
 
-                for flag_rect in self.flags:
-                    if self.player.rect().colliderect(flag_rect):
-                        self.endpoint = True
+                if self.player.rect().collidelist(self.flags) != -1:
+                    self.endpoint = True
 
                 if self.endpoint:
                     self.transition += 1
                     if self.transition > 30:
                         self.timer.update_best_time()
-                        levels = [int(f.split('.')[0]) for f in os.listdir('data/maps') if f.endswith('.json')]
-                        levels.sort()
+                        levels = self.levels
                         current_level_index = levels.index(self.level)
                         if current_level_index == len(levels) - 1:
                             self.load_level(self.level)
@@ -252,9 +261,15 @@ class Game:
 
                 ##### END COMPUTE GAME FLAGS
 
+                # Player rect as of the start of the tick (a level load above may
+                # have replaced the player); enemies update before the player does
+                self.player_rect = self.player.rect()
+                self.dash_active = abs(self.player.dashing) >= 50
+                self.enemy_speeds = enemy_speeds(settings.selected_level)
+
                 # Rendering?
-                self.scroll[0] += (self.player.rect().centerx - self.display.get_width() / 2 - self.scroll[0]) / 30
-                self.scroll[1] += (self.player.rect().centery - self.display.get_height() / 2 - self.scroll[1]) / 30
+                self.scroll[0] += (self.player_rect.centerx - self.display.get_width() / 2 - self.scroll[0]) / 30
+                self.scroll[1] += (self.player_rect.centery - self.display.get_height() / 2 - self.scroll[1]) / 30
                 render_scroll = (int(self.scroll[0]), int(self.scroll[1]))
 
                 #Graphics rendering
@@ -299,4 +314,6 @@ class Game:
         print("Game Over")
 
 if __name__ == "__main__":
-    Game().run()
\ No newline at end of file
+    Game().run()
+    # Leaving through the pause menu ends the game; carry on in the menus
+    Menu()
\ No newline at end of file
@@ -1,13 +1,44 @@
 import pygame
 import sys
-import os
-from datetime import datetime
-from scripts.button import Button
+import time
+import threading
+import warnings
+from collections import deque
 from scripts.displayManager import DisplayManager
 from scripts.settings import settings
-from scripts.tilemap import Tilemap
 from scripts.collectableManager import CollectableManager
 from scripts.ui import UI
+from scripts.utils import list_levels
+
+_pause_option_cache = {}
+
+# The menu is blit-bound; pygame-ce ships the faster SIMD blitters.
+# Checked once on import, a Menu is built again after every game
+if not getattr(pygame, "IS_CE", False):
+    warnings.warn("pygame-ce not detected, install it with 'pip install pygame-ce' for faster rendering.")
+
+# game imports menu, so Game is bound on first use in Menu.play
+_Game = None
+
+# Menus only react to these; everything else (mouse motion, window events) is dropped
+_MENU_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.QUIT)
+
+# Key sets for menu navigation, checked with a single hash lookup
+_NAV_UP = frozenset((pygame.K_UP, pygame.K_w))
+_NAV_DOWN = frozenset((pygame.K_DOWN, pygame.K_s))
+_NAV_LEFT = frozenset((pygame.K_LEFT, pygame.K_a))
+_NAV_RIGHT = frozenset((pygame.K_RIGHT, pygame.K_d))
+_NAV_ENTER = frozenset((pygame.K_RETURN, pygame.K_KP_ENTER))
+_NAV_BACK = frozenset((pygame.K_ESCAPE, pygame.K_BACKSPACE))
+_PAUSE_BACK = _NAV_BACK | {pygame.K_LEFT}
+# Vertical step per navigation key
+_NAV_DELTA = {**dict.fromkeys(_NAV_UP, -1), **dict.fromkeys(_NAV_DOWN, 1)}
+
+def _menu_events():
+    events = pygame.event.get(_MENU_EVENTS)
+    # pump=False so nothing new slips in between the get and the clear
+    pygame.event.clear(pump=False)
+    return events
 
 class Menu:
 
@@ -22,10 +53,24 @@ class Menu:
         self.WIN_H = dm.WIN_H
 
         pygame.display.set_caption("Ninja Game")
-        self.screen = pygame.display.set_mode((self.WIN_W, self.WIN_H))
-        self.display_1 = pygame.Surface((self.BASE_W, self.BASE_H), pygame.SRCALPHA)
-        self.clock = pygame.time.Clock()
-        self.bg = pygame.image.load("data/images/background-big.png")
+        # SCALED presents through SDL's renderer, which is what enables vsync;
+        # fall back to a plain window where no renderer or vsync is available
+        try:
+            self.screen = pygame.display.set_mode((self.WIN_W, self.WIN_H), pygame.SCALED, vsync=1)
+        except pygame.error:
+            self.screen = pygame.display.set_mode((self.WIN_W, self.WIN_H))
+        # Nothing reads motion events, keep a high-rate mouse from flooding the queue
+        pygame.event.set_blocked((pygame.MOUSEMOTION, pygame.JOYAXISMOTION))
+        self._frame_ns = 1_000_000_000 // 60
+        self._next_frame_ns = time.perf_counter_ns()
+        # How late time.sleep woke up over the last second of frames
+        self._oversleep_ns = deque([2_000_000], maxlen=60)
+        # Crop to the base resolution and scale to the window once, so the
+        # menus only have to blit it
+        bg = pygame.image.load("data/images/background-big.png").convert()
+        self.bg_scaled = pygame.transform.scale(bg.subsurface((0, 0, self.BASE_W, self.BASE_H)), (self.WIN_W, self.WIN_H))
+        self.padlock_o = UI.load_ui_img("data/images/padlock-o.png", 0.15)
+        self.padlock_c = UI.load_ui_img("data/images/padlock-c.png", 0.15)
 
         # Load music
         pygame.mixer.music.load('data/music.wav')
@@ -37,27 +82,152 @@ class Menu:
         self.paused = False
 
         self.cm = CollectableManager(None)
-        self.cm.load_collectables()
+        # Read the save file while the first frames draw; screens that use
+        # the counts wait on _cm_ready
+        self._cm_ready = threading.Event()
+        threading.Thread(target=self._load_collectables, daemon=True).start()
+
+        self.refresh_levels()
 
         self.pl = 10
         self.pr = 10
         self.pt = 10
         self.pb = 25
 
-        self.menu()
-        return pygame.font.Font("data/font.ttf", size)
+        self.option_font = UI.get_font(30)
+        self._option_cache = {}
+        self._chromes = {}
+        self._padlock_columns = {}
+        self._full_update = True
+        self._last_drawn = []
+
+        # Accessoires labels, padded to the longest name
+        weapon_width = max(map(len, self.cm.WEAPONS))
+        self._weapons_fmt = [f"{w.ljust(weapon_width):<12}" for w in self.cm.WEAPONS]
+        skin_width = max(map(len, self.cm.SKINS))
+        self._skins_fmt = [f"{s.ljust(skin_width):<15}" for s in self.cm.SKINS]
+
+        # Each screen runs until the user leaves it and returns the next state
+        self._state = "MAIN"
+        self._handlers = {
+            "MAIN": self.menu,
+            "PLAY": self.play,
+            "LEVELS": self.levels,
+            "STORE": self.store,
+            "ACCESSOIRES": self.accessoires,
+            "OPTIONS": self.options,
+        }
+
+        self.run()
+
+    def _load_collectables(self):
+        try:
+            self.cm.load_collectables()
+        finally:
+            self._cm_ready.set()
+
+    def _wait_events(self):
+        # Sleeps in SDL_WaitEventTimeout until input arrives or a frame's
+        # worth of time passes, then drains the rest of the menu input
+        first = pygame.event.wait(16)
+        # Drain even if a window event woke us, input queued behind it
+        # shouldn't have to wait for another pass
+        events = _menu_events()
+        if first.type in _MENU_EVENTS:
+            events.insert(0, first)
+        return events
+
+    def _frame_sync(self):
+        # clock.tick sleeps through SDL_Delay, which can overshoot by 10+ ms.
+        # Sleep until shortly before the deadline, then spin on perf_counter.
+        # The margin follows the worst recent oversleep, so fast timers spin
+        # less and coarse ones still make the deadline; capped so a single
+        # hiccup doesn't turn into a second of busy-waiting.
+        deadline = self._next_frame_ns
+        margin = min(max(self._oversleep_ns) + 250_000, 4_000_000)
+        now = time.perf_counter_ns()
+        remaining = deadline - now
+        if remaining > margin:
+            wake = deadline - margin
+            time.sleep((wake - now) / 1_000_000_000)
+            self._oversleep_ns.append(max(0, time.perf_counter_ns() - wake))
+        while time.perf_counter_ns() < deadline:
+            pass
+
+        now = time.perf_counter_ns()
+        if now - deadline < self._frame_ns:
+            self._next_frame_ns = deadline + self._frame_ns
+        else:
+            self._next_frame_ns = now + self._frame_ns
+
+    def _chrome(self, title, labels):
+        # Background, title and hint labels never change while a screen is
+        # open, so compose them once and blit that opaque surface each frame.
+        # It is part of the full update on entry and never needs to go in drawn.
+        key = (title, labels)
+        chrome = self._chromes.get(key)
+        if chrome is None:
+            chrome = self.bg_scaled.copy()
+            UI.render_menu_title(chrome, title, self.WIN_W // 2, 200)
+            for text, x in labels:
+                UI.render_menu_ui_element(chrome, text, x, self.WIN_H - self.pb)
+            self._chromes[key] = chrome
+        return chrome
+
+    def _padlock_column(self, x, y, locked):
+        # All visible padlocks of a list in one opaque strip cut from the
+        # background, cached per lock pattern so a frame needs a single blit
+        key = (x, y, locked)
+        column = self._padlock_columns.get(key)
+        if column is None:
+            w = max(self.padlock_o.get_width(), self.padlock_c.get_width())
+            h = max(self.padlock_o.get_height(), self.padlock_c.get_height())
+            # 3px covers the 2px outline plus rounding of the centred position
+            rect = pygame.Rect(x - w // 2 - 3, y - h // 2 - 3, w + 6, (len(locked) - 1) * 50 + h + 6)
+            # blit rather than subsurface, columns may hang off the window edge
+            surf = pygame.Surface(rect.size).convert()
+            surf.blit(self.bg_scaled, (-rect.x, -rect.y))
+            for i, is_locked in enumerate(locked):
+                img = self.padlock_c if is_locked else self.padlock_o
+                UI.render_ui_surface(surf, img, x - rect.x, y - rect.y + i * 50)
+            column = self._padlock_columns[key] = (surf, rect)
+        return column
+
+    def _present(self, drawn):
+        # The background never changes, so only rects drawn over it this
+        # frame or the last one can differ from what is on screen
+        if self._full_update:
+            pygame.display.update()
+            self._full_update = False
+        else:
+            pygame.display.update(self._last_drawn + drawn)
+        self._last_drawn = drawn
+
+    def run(self):
+        while True:
+            self._full_update = True
+            self._state = self._handlers[self._state]()
 
     def play(self):
-        from game import Game
-        Game().run()
-        self.menu()
+        global _Game
+        if _Game is None:
+            from game import Game as _Game
+        _Game().run()
+        # The game only calls set_mode if the window size differs, pick up
+        # whatever surface it left behind
+        self.screen = pygame.display.get_surface()
+        # The game saved its coins on the way out; the store reads our copy
+        self._cm_ready.wait()
+        self.cm.load_collectables()
+        return "MAIN"
+
+    def refresh_levels(self):
+        # Rescan data/maps; call again whenever a new map is added
+        self._level_files = list_levels()
 
     def levels(self):
 
-        level_files = [f for f in os.listdir('data/maps') if f.endswith('.json')]
-        level_files.sort()
-        levels = [int(f.split('.')[0]) for f in level_files]
-        levels.sort()
+        levels = self._level_files
         
         level_index = levels.index(self.selected_level) if self.selected_level in levels else 0
         start_index = 0
@@ -66,75 +236,82 @@ class Menu:
         msg_timer = 0
 
         enter = False
+        option_cache = self._option_cache.setdefault("levels", {})
+        # Unlocks only happen in game, so this holds for the whole visit
+        playable = [settings.is_level_playable(level) for level in levels]
 
+        chrome = self._chrome("Select Level", (("backspace to menu", self.pl), ("w/a to navigate", self.WIN_W // 2 - 100)))
+        dirty = True
         while True:
-            for event in pygame.event.get():
+            if dirty:
+                dirty = False
+                self.screen.blit(chrome, (0, 0))
+                drawn = []
+
+                if msg_timer > 0:
+                    drawn.append(UI.render_menu_msg(self.screen, "Level not unlocked!", self.WIN_W // 2, 600))
+                    msg_timer -= 1
+                    # keep redrawing until the message is gone
+                    dirty = True
+            
+                level_options = []
+                for level in levels[start_index:start_index + levels_per_page]:
+                    if level == self.selected_level:
+                        level_options.append(f"*Level {level:<2}")
+                    else:
+                        level_options.append(f"Level {level:<2}")
+
+                locked = tuple(not p for p in playable[start_index:start_index + len(level_options)])
+                drawn.append(self.screen.blit(*self._padlock_column(self.WIN_W // 2 + 150, 300, locked)))
+
+                drawn += UI.draw_blits(self.screen, UI.build_option_blits(self.option_font, level_options, level_index - start_index,
+                                                                          self.WIN_W // 2, 300, 50, UI.SELECTOR_COLOR, UI.PM_COLOR, option_cache))
+                drawn.append(UI.render_menu_ui_element(self.screen, f"Level: {self.selected_level}", self.pl, self.pt))
+
+                self._present(drawn)
+            # Static apart from the message, so idle in the event wait
+            for event in self._wait_events():
+                dirty = True
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
                 if event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_ESCAPE, pygame.K_BACKSPACE): 
-                        self.menu()
-                    if event.key == pygame.K_UP or event.key == pygame.K_w:
+                    if event.key in _NAV_BACK:
+                        return "MAIN"
+                    if event.key in _NAV_UP:
                         level_index = (level_index - 1) % len(levels)
                         if level_index < start_index:
                             start_index = level_index
                         elif level_index >= start_index + levels_per_page:
                             start_index = level_index - levels_per_page + 1
-                    if event.key == pygame.K_DOWN or event.key == pygame.K_s:
+                    if event.key in _NAV_DOWN:
                         level_index = (level_index + 1) % len(levels)
                         if level_index >= start_index + levels_per_page:
                             start_index = level_index - levels_per_page + 1
                         elif level_index < start_index:
                             start_index = level_index
-                    if event.key == pygame.K_RETURN or event.key == pygame.K_KP_ENTER:
+                    if event.key in _NAV_ENTER:
                         enter = True
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     enter = True
                 if enter:
-                    if settings.is_level_playable(levels[level_index]):
-                            self.selected_level = levels[level_index]
-                            settings.selected_level = self.selected_level
+                    if playable[level_index]:
+                        self.selected_level = levels[level_index]
+                        settings.selected_level = self.selected_level
                     else:
                         msg_timer = 60
                 if event.type == pygame.KEYUP:
                     enter = False
                 if event.type == pygame.MOUSEBUTTONUP:
                     enter = False
-                
-            UI.render_menu_bg(self.screen, self.display_1, self.bg)
-            UI.render_menu_title(self.screen, "Select Level", self.WIN_W // 2, 200)
-
-            if msg_timer > 0:
-                UI.render_menu_msg(self.screen, "Level not unlocked!", self.WIN_W // 2, 600)
-                msg_timer -= 1
-            
-            level_options = []
-            for level in levels[start_index:start_index + levels_per_page]:
-                if level == self.selected_level:
-                    level_options.append(f"*Level {level:<2}")
-                else:
-                    level_options.append(f"Level {level:<2}")
-
-            UI.render_o_box(self.screen, level_options, level_index - start_index, self.WIN_W // 2, 300, 50, 30)
-            UI.render_menu_ui_element(self.screen, f"Level: {self.selected_level}", self.pl, self.pt)
-            UI.render_menu_ui_element(self.screen, "backspace to menu", self.pl, self.WIN_H - self.pb)
-            UI.render_menu_ui_element(self.screen, "w/a to navigate", self.WIN_W // 2 - 100, self.WIN_H - self.pb)
-
-            for i, level in enumerate(level_options):
-                current_level = levels[start_index + i]
-                if settings.is_level_playable(current_level):
-                    UI.render_ui_img(self.screen, "data/images/padlock-o.png", self.WIN_W // 2 + 150, 300 + (i * 50), 0.15)
-                else:
-                    UI.render_ui_img(self.screen, "data/images/padlock-c.png", self.WIN_W // 2 + 150, 300 + (i * 50), 0.15)
-
-            pygame.display.update()
-            self.clock.tick(60)
 
     def store(self):
         
+        self._cm_ready.wait()
         options = list(self.cm.ITEMS.keys())
         prices = list(self.cm.ITEMS.values())
+        store_names = options
+        purchaseable = [self.cm.is_purchaseable(name) for name in options]
 
         max_option_length = max(len(option) for option in options)
         options = [f"{options[i].ljust(max_option_length)}  ${prices[i]:<6}" for i in range(len(options))]
@@ -145,36 +322,35 @@ class Menu:
         msg_timer = 0
         w_msg_timer = 0
         enter = False
+        option_cache = self._option_cache.setdefault("store", {})
+        visible_start = None
 
+        chrome = self._chrome("Store", (("backspace to menu", self.pl), ("w/a to navigate", self.WIN_W // 2 - 100)))
+        dirty = True
         while True:
-            for event in pygame.event.get():
+            for event in _menu_events():
+                dirty = True
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
                 if event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_ESCAPE, pygame.K_BACKSPACE):
-                        self.menu()
-                    elif event.key in (pygame.K_UP, pygame.K_w):
-                        selected_option = (selected_option - 1) % len(options)
+                    if event.key in _NAV_BACK:
+                        return "MAIN"
+                    elif event.key in _NAV_DELTA:
+                        selected_option = (selected_option + _NAV_DELTA[event.key]) % len(options)
+                    elif event.key in _NAV_ENTER:
+                        enter = True
                     if selected_option < start_index:
                         start_index = selected_option
                     elif selected_option >= start_index + options_per_page:
                         start_index = selected_option - options_per_page + 1
-                    elif event.key in (pygame.K_DOWN, pygame.K_s):
-                        selected_option = (selected_option + 1) % len(options)
-                    if selected_option >= start_index + options_per_page:
-                        start_index = selected_option - options_per_page + 1
-                    elif selected_option < start_index:
-                        start_index = selected_option
-                    elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
-                        enter = True
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     enter = True
                 if enter:
                     if options[selected_option] == "Back":
-                            self.menu()
+                        return "MAIN"
                     else:
-                        item_name = options[selected_option].split('$')[0].strip()
+                        item_name = store_names[selected_option]
                         buy_item = self.cm.buy_collectable(item_name)
                         if buy_item == "not purchaseable":
                             w_msg = "Item is not purchaseable!"
@@ -191,48 +367,47 @@ class Menu:
                 if event.type == pygame.MOUSEBUTTONUP:
                     enter = False
 
-            UI.render_menu_bg(self.screen, self.display_1, self.bg)
-            UI.render_menu_title(self.screen, "Store", self.WIN_W // 2, 200)
-            UI.render_menu_ui_element(self.screen, f"${self.cm.coins}", self.pl, self.pt)
-
-            end_index = min(start_index + options_per_page, len(options))
-            visible_options = options[start_index:end_index]
-            UI.render_o_box(self.screen, visible_options, selected_option - start_index, self.WIN_W // 2, 300, 50, 30)
-            
-            for i, option in enumerate(visible_options):
-                item_name = option.split('$')[0].strip()
-                y_pos = 300 + (i * 50)
-                if not self.cm.is_purchaseable(item_name):
-                    UI.render_ui_img(self.screen, "data/images/padlock-c.png", self.WIN_W // 2 + 350, y_pos, 0.15)
-                else:
-                    UI.render_ui_img(self.screen, "data/images/padlock-o.png", self.WIN_W // 2 + 350, y_pos, 0.15)
-
-            item_name = options[selected_option].split('$')[0].strip()
-            msg = f"{item_name}: {str(self.cm.get_amount(item_name)):<4}"
-            UI.render_menu_ui_element(self.screen, msg, self.WIN_W - self.pr, self.pt, "right")
+            if dirty:
+                dirty = False
+                self.screen.blit(chrome, (0, 0))
+                drawn = []
+                drawn.append(UI.render_menu_ui_element(self.screen, f"${self.cm.coins}", self.pl, self.pt))
+
+                # The visible page only changes when the list scrolls
+                if start_index != visible_start:
+                    visible_start = start_index
+                    end_index = min(start_index + options_per_page, len(options))
+                    visible_options = options[start_index:end_index]
+                    visible_locked = tuple(not p for p in purchaseable[start_index:end_index])
+                drawn.append(self.screen.blit(*self._padlock_column(self.WIN_W // 2 + 350, 300, visible_locked)))
+                drawn += UI.draw_blits(self.screen, UI.build_option_blits(self.option_font, visible_options, selected_option - start_index,
+                                                                          self.WIN_W // 2, 300, 50, UI.SELECTOR_COLOR, UI.PM_COLOR, option_cache))
+
+                item_name = store_names[selected_option]
+                msg = f"{item_name}: {str(self.cm.get_amount(item_name)):<4}"
+                drawn.append(UI.render_menu_ui_element(self.screen, msg, self.WIN_W - self.pr, self.pt, "right"))
             
-            if w_msg_timer > 0:
-                UI.render_menu_msg(self.screen, w_msg, self.WIN_W // 2, 800)
-                w_msg_timer -= 1
+                if w_msg_timer > 0:
+                    drawn.append(UI.render_menu_msg(self.screen, w_msg, self.WIN_W // 2, 800))
+                    w_msg_timer -= 1
+                    # keep redrawing until the message is gone
+                    dirty = True
 
-            UI.render_menu_ui_element(self.screen, "backspace to menu", self.pl, self.WIN_H - self.pb)
-            UI.render_menu_ui_element(self.screen, "w/a to navigate", self.WIN_W // 2 - 100, self.WIN_H - self.pb)
 
-            pygame.display.update()
-            self.clock.tick(60)
+                self._present(drawn)
+            self._frame_sync()
 
     def accessoires(self):
         title = "Accessoires"
         selected_option = 0
 
-        weapons = self.cm.WEAPONS
-        skins = self.cm.SKINS
-
-        max_option_length = max(len(weapons) for w in weapons)
-        weapons = [f"{weapons[i].ljust(max_option_length):<12}" for i in range(len(weapons))]
-
-        max_wappon_length = max(len(skins) for s in skins)
-        skins = [f"{skins[i].ljust(max_wappon_length):<15}" for i in range(len(skins))]
+        self._cm_ready.wait()
+        weapon_names = self.cm.WEAPONS
+        skin_names = self.cm.SKINS
+        weapons = self._weapons_fmt
+        skins = self._skins_fmt
+        weapon_purchaseable = [self.cm.is_purchaseable(name) for name in weapon_names]
+        skin_purchaseable = [self.cm.is_purchaseable(name) for name in skin_names]
 
         selected_option = 0
         selected_weapon = 0
@@ -242,33 +417,27 @@ class Menu:
         msg_timer = 0
         w_msg_timer = 0
         enter = False
+        weapon_cache = self._option_cache.setdefault("weapons", {})
+        skin_cache = self._option_cache.setdefault("skins", {})
+        view = None
 
+        chrome = self._chrome(title, (("tab to switch between weapons/skins", self.WIN_W // 2 - 270), ("esc to menu", self.pl)))
+        dirty = True
         while True:
-
-            UI.render_menu_bg(self.screen, self.display_1, self.bg)
-            UI.render_menu_title(self.screen, title, self.WIN_W // 2, 200)
-            UI.render_menu_subtitle(self.screen, "Weapons", self.WIN_W // 2 - 350, 320)
-            UI.render_menu_subtitle(self.screen, "Skins", self.WIN_W // 2 + 350, 320)
-            UI.render_menu_ui_element(self.screen, f"${self.cm.coins}", self.pl, self.pt)
-            UI.render_menu_ui_element(self.screen, f"Skin: {self.cm.SKINS[settings.selected_skin]}", self.pl, self.pt + 20)
-            UI.render_menu_ui_element(self.screen, f"Weapon: {self.cm.WEAPONS[settings.selected_weapon]}", self.pl, self.pt + 20*2)
-            UI.render_menu_ui_element(self.screen, "tab to switch between weapons/skins", self.WIN_W // 2 - 270, self.WIN_H - self.pb)
-            UI.render_menu_ui_element(self.screen, "esc to menu", self.pl, self.WIN_H - self.pb)
-
-
-            for event in pygame.event.get():
+            for event in _menu_events():
+                dirty = True
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
                 if event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_ESCAPE, pygame.K_BACKSPACE):
-                        self.menu()
-                    if event.key in (pygame.K_UP, pygame.K_w):
+                    if event.key in _NAV_BACK:
+                        return "MAIN"
+                    if event.key in _NAV_UP:
                         if selected_option == 0:
                             selected_weapon = (selected_weapon - 1) % len(weapons)
                         else:
                             selected_skin = (selected_skin - 1) % len(skins)
-                    if event.key in (pygame.K_DOWN, pygame.K_s):
+                    if event.key in _NAV_DOWN:
                         if selected_option == 0:
                             selected_weapon = (selected_weapon + 1) % len(weapons)
                         else: 
@@ -277,18 +446,18 @@ class Menu:
                         selected_option = (selected_option + 1) % 2
                         selected_weapon = 0
                         selected_skin = 0
-                    if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                    if event.key in _NAV_ENTER:
                         enter = True
                     
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     enter = True
                 if enter:
                     if selected_option == 0:
-                            selected_weapon_name = weapons[selected_weapon].strip()
+                            selected_weapon_name = weapon_names[selected_weapon]
                             if self.cm.get_amount(selected_weapon_name) > 0:
                                 settings.selected_weapon = selected_weapon
                     else: 
-                        selected_skin_name = skins[selected_skin].strip()
+                        selected_skin_name = skin_names[selected_skin]
                         if self.cm.get_amount(selected_skin_name) > 0:
                             settings.selected_skin = selected_skin
 
@@ -297,143 +466,164 @@ class Menu:
                 if event.type == pygame.MOUSEBUTTONUP:
                     enter = False
 
-            options_per_page = 4
-            weapon_start = 0
-            skin_start = 0
-
-            # Handle scrolling for weapons
-            if selected_option == 0:
-                if selected_weapon >= weapon_start + options_per_page:
-                    weapon_start = selected_weapon - options_per_page + 1
-                elif selected_weapon < weapon_start:
-                    weapon_start = selected_weapon
-
-            # Handle scrolling for skins
-            if selected_option == 1:
-                if selected_skin >= skin_start + options_per_page:
-                    skin_start = selected_skin - options_per_page + 1
-                elif selected_skin < skin_start:
-                    skin_start = selected_skin
-
-            weapon_options = []
-            for i in range(weapon_start, min(weapon_start + options_per_page, len(weapons))):
-                if i == settings.selected_weapon:
-                    weapon_options.append(f"*{weapons[i]}")
-                else:
-                    weapon_options.append(f" {weapons[i]}")
-
-                weapon = weapons[i].strip()
-                if not self.cm.is_purchaseable(weapon):
-                    UI.render_ui_img(self.screen, "data/images/padlock-c.png", 
-                                   self.WIN_W // 2 - 150, 430 + ((i - weapon_start) * 50), 0.15)
-                else:
-                    UI.render_ui_img(self.screen, "data/images/padlock-o.png",
-                                   self.WIN_W // 2 - 150, 430 + ((i - weapon_start) * 50), 0.15)
-
-            skin_options = []
-            for i in range(skin_start, min(skin_start + options_per_page, len(skins))):
-                if i == settings.selected_skin:
-                    skin_options.append(f"*{skins[i]}")
-                else:
-                    skin_options.append(f" {skins[i]}")
-
-                skin = skins[i].strip()
-                if not self.cm.is_purchaseable(skin):
-                    UI.render_ui_img(self.screen, "data/images/padlock-c.png",
-                                   self.WIN_W // 2 + 600, 430 + ((i - skin_start) * 50), 0.15)
-                else:
-                    UI.render_ui_img(self.screen, "data/images/padlock-o.png",
-                                   self.WIN_W // 2 + 600, 430 + ((i - skin_start) * 50), 0.15)
-
-            UI.render_o_box(self.screen, weapon_options, 
-                          (selected_weapon - weapon_start) if selected_option == 0 else -1, 
-                          self.WIN_W // 2 - 350, 430, 50, 30)
-
-            UI.render_o_box(self.screen, skin_options, 
-                          (selected_skin - skin_start) if selected_option == 1 else -1,
-                          self.WIN_W // 2 + 350, 430, 50, 30)
-
-
-            pygame.display.update()
-            self.clock.tick(60)
-
-
+            if dirty:
+                dirty = False
+                self.screen.blit(chrome, (0, 0))
+                drawn = []
+                drawn.append(UI.render_menu_subtitle(self.screen, "Weapons", self.WIN_W // 2 - 350, 320))
+                drawn.append(UI.render_menu_subtitle(self.screen, "Skins", self.WIN_W // 2 + 350, 320))
+                drawn.append(UI.render_menu_ui_element(self.screen, f"${self.cm.coins}", self.pl, self.pt))
+                drawn.append(UI.render_menu_ui_element(self.screen, f"Skin: {self.cm.SKINS[settings.selected_skin]}", self.pl, self.pt + 20))
+                drawn.append(UI.render_menu_ui_element(self.screen, f"Weapon: {self.cm.WEAPONS[settings.selected_weapon]}", self.pl, self.pt + 20*2))
+
+
+                # Rebuild the visible lists only when a selection changed
+                state = (selected_option, selected_weapon, selected_skin, settings.selected_weapon, settings.selected_skin)
+                if state != view:
+                    view = state
+                    options_per_page = 4
+                    weapon_start = 0
+                    skin_start = 0
+
+                    # Handle scrolling for weapons
+                    if selected_option == 0:
+                        if selected_weapon >= weapon_start + options_per_page:
+                            weapon_start = selected_weapon - options_per_page + 1
+                        elif selected_weapon < weapon_start:
+                            weapon_start = selected_weapon
+
+                    # Handle scrolling for skins
+                    if selected_option == 1:
+                        if selected_skin >= skin_start + options_per_page:
+                            skin_start = selected_skin - options_per_page + 1
+                        elif selected_skin < skin_start:
+                            skin_start = selected_skin
+
+                    weapon_range = range(weapon_start, min(weapon_start + options_per_page, len(weapons)))
+                    weapon_options = [f"*{weapons[i]}" if i == settings.selected_weapon else f" {weapons[i]}"
+                                      for i in weapon_range]
+                    skin_range = range(skin_start, min(skin_start + options_per_page, len(skins)))
+                    skin_options = [f"*{skins[i]}" if i == settings.selected_skin else f" {skins[i]}"
+                                    for i in skin_range]
+
+                    weapon_locked = tuple(not weapon_purchaseable[i] for i in weapon_range)
+                    skin_locked = tuple(not skin_purchaseable[i] for i in skin_range)
+
+                drawn.append(self.screen.blit(*self._padlock_column(self.WIN_W // 2 - 150, 430, weapon_locked)))
+                drawn.append(self.screen.blit(*self._padlock_column(self.WIN_W // 2 + 600, 430, skin_locked)))
+
+                drawn += UI.draw_blits(self.screen, UI.build_option_blits(self.option_font, weapon_options,
+                                                                          (selected_weapon - weapon_start) if selected_option == 0 else -1,
+                                                                          self.WIN_W // 2 - 350, 430, 50, UI.SELECTOR_COLOR, UI.PM_COLOR, weapon_cache))
+
+                drawn += UI.draw_blits(self.screen, UI.build_option_blits(self.option_font, skin_options,
+                                                                          (selected_skin - skin_start) if selected_option == 1 else -1,
+                                                                          self.WIN_W // 2 + 350, 430, 50, UI.SELECTOR_COLOR, UI.PM_COLOR, skin_cache))
+
+                self._present(drawn)
+            self._frame_sync()
 
     def options(self):
         title = "Options"
         selected_option = 0
+        option_cache = self._option_cache.setdefault("options", {})
+        pending_music_vol = settings.music_volume
+        pending_sound_vol = settings.sound_volume
 
+        shown_volumes = None
+
+        chrome = self._chrome(title, (("backspace to menu", self.pl), ("w/a to navigate", self.WIN_W // 2 - 100)))
+        dirty = True
         while True:
             
-            options = [
-                f"Music Volume:{int(settings.music_volume * 100):3d}%", 
-                f"Sound Volume:{int(settings.sound_volume * 100):3d}%"
-            ]
-
-            for event in pygame.event.get():
+            # Only reformat the labels when a volume actually changed
+            volumes = (settings.music_volume, settings.sound_volume)
+            if volumes != shown_volumes:
+                shown_volumes = volumes
+                options = [
+                    f"Music Volume:{int(settings.music_volume * 100):3d}%", 
+                    f"Sound Volume:{int(settings.sound_volume * 100):3d}%"
+                ]
+                dirty = True
+
+            for event in _menu_events():
+                dirty = True
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
                 if event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_ESCAPE, pygame.K_BACKSPACE):
-                        self.menu()
-                    elif event.key in (pygame.K_UP, pygame.K_w):
-                        selected_option = (selected_option - 1) % len(options)
-                    elif event.key in (pygame.K_DOWN, pygame.K_s):
-                        selected_option = (selected_option + 1) % len(options)
-                    elif event.key == pygame.K_LEFT or event.key == pygame.K_a:
+                    if event.key in _NAV_BACK:
+                        return "MAIN"
+                    elif event.key in _NAV_DELTA:
+                        selected_option = (selected_option + _NAV_DELTA[event.key]) % len(options)
+                    elif event.key in _NAV_LEFT:
                         if options[selected_option] == options[0]:
-                            settings.music_volume = max(0.0, settings.music_volume - 0.1)
-                            pygame.mixer.music.set_volume(settings.music_volume)
+                            pending_music_vol = round(max(0.0, pending_music_vol - 0.1), 1)
                         elif options[selected_option] == options[1]:
-                            settings.sound_volume = max(0.0, settings.sound_volume - 0.1)
-                    elif event.key == pygame.K_RIGHT or event.key == pygame.K_d:
+                            pending_sound_vol = round(max(0.0, pending_sound_vol - 0.1), 1)
+                    elif event.key in _NAV_RIGHT:
                         if options[selected_option] == options[0]:
-                            settings.music_volume = min(1.0, settings.music_volume + 0.1)
-                            pygame.mixer.music.set_volume(settings.music_volume)
+                            pending_music_vol = round(min(1.0, pending_music_vol + 0.1), 1)
                         elif options[selected_option] == options[1]:
-                            settings.sound_volume = min(1.0, settings.sound_volume + 0.1)
-            
-            UI.render_menu_bg(self.screen, self.display_1, self.bg)
-            UI.render_menu_title(self.screen, title, self.WIN_W // 2, 200)
-            UI.render_o_box(self.screen, options, selected_option, self.WIN_W // 2, 300, 50)
-            UI.render_menu_ui_element(self.screen, "backspace to menu", self.pl, self.WIN_H - self.pb)
-            UI.render_menu_ui_element(self.screen, "w/a to navigate", self.WIN_W // 2 - 100, self.WIN_H - self.pb)
+                            pending_sound_vol = round(min(1.0, pending_sound_vol + 0.1), 1)
 
-            pygame.display.update()
-            self.clock.tick(60)
+            # Apply volumes once per frame, however many key repeats fired
+            if pending_music_vol != settings.music_volume:
+                settings.music_volume = pending_music_vol
+                pygame.mixer.music.set_volume(pending_music_vol)
+            if pending_sound_vol != settings.sound_volume:
+                settings.sound_volume = pending_sound_vol
+
+            if dirty:
+                dirty = False
+                self.screen.blit(chrome, (0, 0))
+                drawn = []
+                drawn += UI.draw_blits(self.screen, UI.build_option_blits(self.option_font, options, selected_option,
+                                                                          self.WIN_W // 2, 300, 50, UI.SELECTOR_COLOR, UI.PM_COLOR, option_cache))
+
+                self._present(drawn)
+            self._frame_sync()
 
     def menu(self):
 
         title = "Menu"
         options = ["Play", "Levels", "Store", "Accessoires", "Options", "Quit"]
+        # State run() switches to for each option; None quits
+        actions = {"Play": "PLAY", "Levels": "LEVELS", "Store": "STORE",
+                   "Accessoires": "ACCESSOIRES", "Options": "OPTIONS", "Quit": None}
         self.selected_option = 0 
         enter = False
+        option_cache = self._option_cache.setdefault("menu", {})
+        chrome = self._chrome(title, (("w/a to navigate", self.WIN_W // 2 - 100), ("esc to quit", self.pl)))
+        dirty = True
 
         while True:
 
-            UI.render_menu_bg(self.screen, self.display_1, self.bg)
-            UI.render_menu_title(self.screen, title, self.WIN_W // 2 , 200)
-            UI.render_o_box(self.screen, options, self.selected_option, self.WIN_W // 2, 300, 50)
-            UI.render_menu_ui_element(self.screen, "w/a to navigate", self.WIN_W // 2 - 100, self.WIN_H - self.pb)
-            UI.render_menu_ui_element(self.screen, "esc to quit", self.pl, self.WIN_H - self.pb)
-
-            for event in pygame.event.get():
+            # Nothing animates here, so only redraw after input
+            if dirty:
+                self.screen.blit(chrome, (0, 0))
+                drawn = []
+                drawn += UI.draw_blits(self.screen, UI.build_option_blits(self.option_font, options, self.selected_option,
+                                                                          self.WIN_W // 2, 300, 50, UI.SELECTOR_COLOR, UI.PM_COLOR, option_cache))
+
+                self._present(drawn)
+                dirty = False
+
+            events = self._wait_events()
+            if not events:
+                continue
+            # Key repeats queued within one frame add up to a single move
+            step = 0
+            for event in events:
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
                 if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE or event.key == pygame.K_BACKSPACE:
-                        pass
-                        #pygame.quit()
-                        #sys.exit()
-                    if event.key == pygame.K_UP or event.key == pygame.K_w:
-                        self.selected_option = (self.selected_option - 1) % len(options)
-                    if event.key == pygame.K_DOWN or event.key == pygame.K_s:
-                        self.selected_option = (self.selected_option + 1) % len(options)
-                    if event.key == pygame.K_RETURN or event.key == pygame.K_KP_ENTER:
+                    step += _NAV_DELTA.get(event.key, 0)
+                    if event.key in _NAV_ENTER:
                         enter = True
                     if event.key == pygame.K_ESCAPE:
+                        self._cm_ready.wait()
                         self.cm.save_collectables()
                         settings.save_settings()
                         pygame.quit()
@@ -443,27 +633,21 @@ class Menu:
                     enter = True
                 
                 if enter:
-                    if options[self.selected_option] == options[0]:
-                            self.play()
-                    if options[self.selected_option] == options[1]:
-                        self.levels()
-                    if options[self.selected_option] == options[2]:
-                        self.store()
-                    if options[self.selected_option] == options[3]:
-                        self.accessoires()
-                    if options[self.selected_option] == options[4]:
-                        self.options()
-                    if options[self.selected_option] == options[5]:
+                    self.selected_option = (self.selected_option + step) % len(options)
+                    action = actions[options[self.selected_option]]
+                    if action is None:
                         pygame.quit()
                         sys.exit()
+                    return action
                 
                 if event.type == pygame.KEYUP:
                     enter = False
                 if event.type == pygame.MOUSEBUTTONUP:
                     enter = False
 
-            pygame.display.update()
-            self.clock.tick(60)
+            if step % len(options):
+                self.selected_option = (self.selected_option + step) % len(options)
+                dirty = True
 
     def pause_menu(game):
         title = "Pause Menu"
@@ -474,24 +658,41 @@ class Menu:
         message_timer = 0
         enter = False
 
+        # Scale the background to the window once for the whole pause
+        screen = game.screen
+        display = game.display_3
+        display.blit(game.assets['background'], (0, 0))
+        bg = pygame.transform.scale(display, (game.WIN_W, game.WIN_H)).convert()
+        # The title and HUD are frozen while paused, draw them onto it once
+        UI.render_menu_title(bg, title, game.WIN_W // 2, 200)
+        UI.render_menu_ui_element(bg, f"{game.timer.text}", game.WIN_W - 130, 5)
+        UI.render_menu_ui_element(bg, f"{game.timer.best_time_text}", game.WIN_W - 130, 25)
+        UI.render_menu_ui_element(bg, f"Level: {game.level}", game.WIN_W // 2 - 40, 5)
+        UI.render_menu_ui_element(bg, f"Lives: {game.player.lifes}", 5, 5)
+        UI.render_menu_ui_element(bg, f"Coins: ${game.cm.coins}", 5, 25)
+        UI.render_menu_ui_element(bg, f"Ammo:  {game.cm.ammo}", 5, 45)
+        UI.render_menu_ui_element(bg, "w/a to navigate", game.WIN_W // 2 - 100, game.WIN_H - 25)
+        font = UI.get_font(30)
+        last_drawn = None
+
+        dirty = True
         while pause:
-            for event in pygame.event.get():
+            for event in _menu_events():
+                dirty = True
                 if event.type == pygame.QUIT:
-                    game.save_game()
+                    game.tilemap.save_game()
                     pygame.quit()
                     sys.exit()
                 if event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_ESCAPE, pygame.K_BACKSPACE, pygame.K_LEFT):
+                    if event.key in _PAUSE_BACK:
                         game.tilemap.save_game()
+                        # Game.run ends and hands control back to Menu.run
                         game.running = False
                         pause = False
-                        Menu().menu()  
                         return
-                    elif event.key in (pygame.K_UP, pygame.K_w):
-                        selected_option = (selected_option - 1) % len(options)
-                    elif event.key in (pygame.K_DOWN, pygame.K_s):
-                        selected_option = (selected_option + 1) % len(options)
-                    elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                    elif event.key in _NAV_DELTA:
+                        selected_option = (selected_option + _NAV_DELTA[event.key]) % len(options)
+                    elif event.key in _NAV_ENTER:
                         enter = True
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:
@@ -513,33 +714,31 @@ class Menu:
                         #game.tilemap.save_game()
                         game.running = False
                         pause = False
-                        Menu().menu()
                         return
                 if event.type == pygame.KEYUP:
                     enter = False
                 if event.type == pygame.MOUSEBUTTONUP:
                     enter = False
-            
-            screen = game.screen
-            display = game.display_3
-            bg = game.assets['background']
-
-            UI.render_menu_bg(screen, display, bg)
-            UI.render_menu_title(screen, title, game.WIN_W // 2, 200)
-            UI.render_menu_ui_element(screen, f"{game.timer.text}", game.WIN_W - 130, 5)
-            UI.render_menu_ui_element(screen, f"{game.timer.best_time_text}", game.WIN_W - 130, 25)
-            UI.render_menu_ui_element(screen, f"Level: {game.level}", game.WIN_W // 2 - 40, 5)
-            UI.render_menu_ui_element(screen, f"Lives: {game.player.lifes}", 5, 5)
-            UI.render_menu_ui_element(screen, f"Coins: ${game.cm.coins}", 5, 25)
-            UI.render_menu_ui_element(screen, f"Ammo:  {game.cm.ammo}", 5, 45)
-            UI.render_o_box(screen, options, selected_option, game.WIN_W // 2, 450, 50)
-            UI.render_menu_ui_element(screen, "w/a to navigate", game.WIN_W // 2 - 100, game.WIN_H - 25)
-            
-            if message_timer > 0:
-                UI.render_menu_msg(screen, message, game.WIN_W // 2, 700)
-                message_timer -= 1
 
-            pygame.display.update()
+            if dirty:
+                dirty = False
+                screen.blit(bg, (0, 0))
+                drawn = UI.draw_blits(screen, UI.build_option_blits(font, options, selected_option,
+                                                                    game.WIN_W // 2, 450, 50, UI.SELECTOR_COLOR, UI.PM_COLOR, _pause_option_cache))
+            
+                if message_timer > 0:
+                    drawn.append(UI.render_menu_msg(screen, message, game.WIN_W // 2, 700))
+                    message_timer -= 1
+                    # keep redrawing until the message is gone
+                    dirty = True
+
+                # Title and HUD are frozen while paused, after the first full
+                # update only the options and the message can change
+                if last_drawn is None:
+                    pygame.display.update()
+                else:
+                    pygame.display.update(last_drawn + drawn)
+                last_drawn = drawn
             game.clock.tick(60)
 
         return
@@ -1,10 +1,8 @@
 import os
 import json
-from scripts.collectables import Collectables
-from scripts.utils import load_image
+from scripts.collectables import Collectables, scaled_frame
 from scripts import settings
 
-COIN_IMAGE_PATH = 'collectables/coin.png'
 DATA_FILE = 'data/collectables.json'
 
 
@@ -51,92 +49,147 @@ class CollectableManager:
         "Berzerker": 10000,
     }
 
+    # Attribute holding each item's count, and how many one purchase adds
+    ITEM_FIELDS = {
+        "Gun": ("gun", 1),
+        "Ammo": ("ammo", 25),
+        "Shield": ("shield", 1),
+        "Moon Boots": ("moon_boots", 1),
+        "Ninja Stars": ("ninja_stars", 3),
+        "Sword": ("sword", 1),
+        "Grapple Hook": ("grapple_hook", 1),
+        "Red Ninja": ("red_ninja", 1),
+        "Blue Ninja": ("blue_ninja", 1),
+        "Green Ninja": ("green_ninja", 1),
+    }
+
+    # Key in the data file -> attribute
+    SAVED_FIELDS = {
+        "coin_count": "coins",
+        "gun": "gun",
+        "ammo": "ammo",
+        "red_ninja": "red_ninja",
+    }
+
     def __init__(self, game):
         self.coin_list = []
         self.game = game
-        self.coin_count = self.load_collectable_count()
+        # Wallet; saved under "coin_count" (see SAVED_FIELDS)
         self.coins = 0
-        self.gun = 0
-        self.ammo = 0
-        self.shield = 0
-        self.moon_boots = 0
-        self.ninja_stars = 0
-        self.sword = 0
-        self.grapple_hook = 0
-        self.red_ninja = 0
-        self.blue_ninja = 0
-        self.green_ninja = 0
-
-    ### DEPRECATED ###
-    def load_collectable_count(self):
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r') as f:
-                data = json.load(f)
-                return data.get('coin_count', 0)
+        # One counter per item, all named in ITEM_FIELDS
+        for field, _ in self.ITEM_FIELDS.values():
+            setattr(self, field, 0)
+        # What the data file holds as far as we know, to skip no-op saves
+        self._saved = None
+        # Pickups from the last level load, recycled by the next one
+        self._spawned = []
+        self._pool = []
+        # Scaled pickup frames, keyed by this game's animation frames
+        self._scaled_frames = {}
+
+    def scaled_frame(self, frame):
+        cached = self._scaled_frames.get(frame)
+        if cached is None:
+            cached = self._scaled_frames[frame] = scaled_frame(frame)
+        return cached
+
+    def _spawn(self, pos, animation):
+        if self._pool:
+            pickup = self._pool.pop()
+            pickup.reset(pos, animation)
         else:
-            with open(DATA_FILE, 'w') as f:
-                json.dump({"coin_count": 0}, f, indent=4)
-            return 0
-
-    ### DEPRECATED ###
-    def save_collectable_count(self):
-        with open(DATA_FILE, 'w') as f:
-            json.dump({"coin_count": self.coin_count}, f, indent=4)
+            pickup = Collectables(self.game, pos, animation, shared=True)
+        self._spawned.append(pickup)
+        return pickup
 
     def load_collectables_from_tilemap(self, tilemap):
+        # Respawning reloads the level, so hand the old pickups back
+        self._pool += self._spawned
+        self._spawned = []
         self.coin_list = []
         self.ammo_pickups = []
+        # Pickups of a kind all spawn together and animate in lockstep,
+        # so one animation per kind is stepped for all of them
+        self.coin_animation = self.game.assets['coin'].copy()
         
         coin_tiles = tilemap.extract([('coin', 0)], keep=False)
         for tile in coin_tiles:
-            self.coin_list.append(Collectables(self.game, tile['pos'], self.game.assets['coin']))
+            self.coin_list.append(self._spawn(tile['pos'], self.coin_animation))
         
         ammo_tiles = tilemap.extract([('ammo', 0)], keep=False)
+        # Not every asset set has ammo, only look it up when a map places some
+        self.ammo_animation = self.game.assets['ammo'].copy() if ammo_tiles else None
         for tile in ammo_tiles:
-            self.ammo_pickups.append(Collectables(self.game, tile['pos'], self.game.assets['ammo']))
+            self.ammo_pickups.append(self._spawn(tile['pos'], self.ammo_animation))
+
+        self.coin_rects = [coin.rect for coin in self.coin_list]
+        self.ammo_rects = [ammo.rect for ammo in self.ammo_pickups]
 
     def update(self, player_rect):
-        for coin in self.coin_list[:]:
-            if coin.update(player_rect):
-                self.coin_list.remove(coin)
-                self.coin_count += 1
+        self.coin_animation.update()
+        if self.ammo_pickups:
+            self.ammo_animation.update()
+
+        # One C-level pass over the rects finds the pickups touching the
+        # player; the lists are only rebuilt when something was collected
+        hits = player_rect.collidelistall(self.coin_rects)
+        if hits:
+            for i in hits:
                 self.coins += 1
                 self.game.sfx['collect'].play()
+            hit = set(hits)
+            self.coin_list = [coin for i, coin in enumerate(self.coin_list) if i not in hit]
+            self.coin_rects = [coin.rect for coin in self.coin_list]
         
-        for ammo in self.ammo_pickups[:]:
-            if ammo.update(player_rect):
-                self.ammo_pickups.remove(ammo)
+        hits = player_rect.collidelistall(self.ammo_rects)
+        if hits:
+            for i in hits:
                 self.ammo += 5
                 self.game.sfx['collect'].play()
+            hit = set(hits)
+            self.ammo_pickups = [ammo for i, ammo in enumerate(self.ammo_pickups) if i not in hit]
+            self.ammo_rects = [ammo.rect for ammo in self.ammo_pickups]
 
     def render(self, surf, offset=(0,0)):
-        for coin in self.coin_list:
-            coin.render(surf, offset=offset)
+        # Every coin shows the same frame: scale it once and blit the
+        # whole set in one call
+        frame, diff_y = self.scaled_frame(self.coin_animation.img())
+        ox, oy = offset[0], offset[1] - diff_y
+        surf.blits([(frame, (coin.rect.x - ox, coin.rect.y - oy)) for coin in self.coin_list], doreturn=False)
 
 
     def load_collectables(self):
-        if os.path.exists(DATA_FILE):
-            try:
-                with open(DATA_FILE, "r") as f:
-                    data = json.load(f)
-                    self.coins = data.get("coin_count", 0)
-                    self.gun = data.get("gun", 0)
-                    self.ammo = data.get("ammo", 0)
-                    self.red_ninja = data.get("red_ninja", 0)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading collectable: {e}")
+        # A missing file just means nothing has been collected yet
+        try:
+            with open(DATA_FILE, "r") as f:
+                data = json.load(f)
+                for key, field in self.SAVED_FIELDS.items():
+                    setattr(self, field, data.get(key, 0))
+            self._saved = self._save_data()
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading collectable: {e}")
+
+    def _save_data(self):
+        return {key: getattr(self, field) for key, field in self.SAVED_FIELDS.items()}
     
     def save_collectables(self):
-        data = {
-            "coin_count": self.coins,
-            "gun": self.gun,
-            "ammo": self.ammo,
-            "red_ninja": self.red_ninja
-        }
+        data = self._save_data()
+        if data == self._saved:
+            return
         try:
             os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-            with open(DATA_FILE, "w") as f:
+            # Write a temp file and swap it in, so a crash mid-write can't
+            # leave a truncated save behind
+            tmp_file = DATA_FILE + ".tmp"
+            with open(tmp_file, "w") as f:
                 json.dump(data, f, indent=4)
+                # Make sure the data is on disk before the rename points at it
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, DATA_FILE)
+            self._saved = data
         except IOError as e:
             print(f"Error saving collectable: {e}")
 
@@ -146,28 +199,10 @@ class CollectableManager:
     def buy_collectable(self, item):
 
         if self.is_purchaseable(item):
-            self.load_collectables()
             if self.coins >= self.ITEMS[item]:
-                if item == "Gun":
-                    self.gun += 1
-                elif item == "Ammo":
-                    self.ammo += 25
-                elif item == "Shield":
-                    self.shield += 1
-                elif item == "Moon Boots":
-                    self.moon_boots += 1
-                elif item == "Ninja Stars":
-                    self.ninja_stars += 3
-                elif item == "Sword":
-                    self.sword += 1
-                elif item == "Grapple Hook":
-                    self.grapple_hook += 1
-                elif item == "Red Ninja":
-                    self.red_ninja += 1
-                elif item == "Blue Ninja":
-                    self.blue_ninja += 1
-                elif item == "Green Ninja":
-                    self.green_ninja += 1
+                if item in self.ITEM_FIELDS:
+                    field, amount = self.ITEM_FIELDS[item]
+                    setattr(self, field, getattr(self, field) + amount)
                 
                 self.coins -= self.ITEMS[item]
                 self.save_collectables()
@@ -185,21 +220,6 @@ class CollectableManager:
     def get_amount(self, item):
         if item == "Default":
             return 1
-        if item == "Gun":
-            return self.gun
-        elif item == "Ammo":
-            return self.ammo
-        elif item == "Shield":
-            return self.shield
-        elif item == "Moon Boots":
-            return self.moon_boots
-        elif item == "Ninja Stars":
-            return self.ninja_stars
-        elif item == "Sword":
-            return self.sword
-        elif item == "Grapple Hook":
-            return self.grapple_hook
-        elif item == "Red Ninja":
-            return self.red_ninja
-        else:
-            return 0
\ No newline at end of file
+        if item in self.ITEM_FIELDS:
+            return getattr(self, self.ITEM_FIELDS[item][0])
+        return 0
\ No newline at end of file
@@ -1,35 +1,36 @@
 import pygame
 
+# Kleiner Münz-Frame; der CollectableManager cached das Ergebnis pro Frame
+def scaled_frame(frame):
+    w, h = frame.get_size()
+    # Auf halbe Größe skalieren
+    scaled_w = w - w*1/3
+    scaled_h = h - h*1/3
+    # Münze nach oben verschieben, damit sie "in der Luft schwebt"
+    diff_y = (h - scaled_h) // 2
+    return pygame.transform.scale(frame, (scaled_w, scaled_h)), diff_y
+
 class Collectables:
-    def __init__(self, game, pos, animation):
+    __slots__ = ('game', 'animation', 'rect')
+
+    def __init__(self, game, pos, animation, shared=False):
         self.game = game
-        self.pos = list(pos)
-        self.size = (16, 16)
-        self.animation = animation.copy()
-        self.rect = pygame.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
+        # shared: the owner steps one animation for all its pickups
+        self.animation = animation if shared else animation.copy()
+        # Position and hitbox in one; the manager tests all rects at once
+        self.rect = pygame.Rect(pos[0], pos[1], 16, 16)
 
-    def update(self, player_rect):
-        self.animation.update()
-        return self.rect.colliderect(player_rect)
+    def reset(self, pos, animation):
+        # Reuse this pickup elsewhere with a shared animation
+        self.animation = animation
+        self.rect.topleft = pos
 
     def render(self, surf, offset=(0,0)):
-        # Aktuelles Frame holen
-        current_frame = self.animation.img()
-        
-        # Originale Größe
-        w, h = current_frame.get_size()
-        
-        # Auf halbe Größe skalieren
-        scaled_w = w - w*1/3
-        scaled_h = h - h*1/3
-        scaled_frame = pygame.transform.scale(current_frame, (scaled_w, scaled_h))
-        
-        # Münze nach oben verschieben, damit sie "in der Luft schwebt"
-        # Angenommen, sie soll um die Hälfte der Größen-Differenz nach oben:
-        diff_y = (h - scaled_h) // 2
+        # Aktuelles Frame holen (bereits skaliert)
+        frame, diff_y = self.game.cm.scaled_frame(self.animation.img())
         
         # Render-Position berechnen
-        render_x = self.pos[0] - offset[0]
-        render_y = self.pos[1] - offset[1] + diff_y  # nach oben schieben
+        render_x = self.rect.x - offset[0]
+        render_y = self.rect.y - offset[1] + diff_y  # nach oben schieben
         
-        surf.blit(scaled_frame, (render_x, render_y))
\ No newline at end of file
+        surf.blit(frame, (render_x, render_y))
\ No newline at end of file
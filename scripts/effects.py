@@ -1,6 +1,8 @@
 import pygame
 import math
 import random
+from scripts.particle import Particle
+from scripts.spark import Spark
 
 class Effects:
     """
@@ -9,10 +11,27 @@ class Effects:
     
     def screenshake(game):
         screenshake_offset = (random.random() * game.screenshake - game.screenshake / 2, random.random() * game.screenshake - game.screenshake / 2)
-        game.screen.blit(pygame.transform.scale(game.display_2, game.screen.get_size()), screenshake_offset)
+        game.screen.blit(pygame.transform.scale(game.display_2, (game.WIN_W, game.WIN_H)), screenshake_offset)
 
     def transition(game):
-        transition_surf = pygame.Surface(game.display.get_size())
-        pygame.draw.circle(transition_surf, (255, 255, 255), (game.display.get_width() // 2, game.display.get_height() // 2), (30 - abs(game.transition)) * 8)
+        transition_surf = pygame.Surface((game.BASE_W, game.BASE_H))
+        pygame.draw.circle(transition_surf, (255, 255, 255), (game.BASE_W // 2, game.BASE_H // 2), (30 - abs(game.transition)) * 8)
         transition_surf.set_colorkey((255, 255, 255))
-        game.display.blit(transition_surf, (0, 0))
\ No newline at end of file
+        game.display.blit(transition_surf, (0, 0))
+
+    def hit_burst(game, center, count=30):
+        # Sparks plus particles flying the opposite way; the lookups are
+        # bound once and the pieces land in the game's lists in one go
+        rand = random.random
+        cos, sin, pi = math.cos, math.sin, math.pi
+        sparks = []
+        particles = []
+        for i in range(count):
+            angle = rand() * pi * 2
+            speed = rand() * 5
+            sparks.append(Spark(center, angle, 2 + rand()))
+            particles.append(Particle(game, 'particle', center,
+                                      velocity=[cos(angle + pi) * speed * 0.5, sin(angle + pi) * speed * 0.5],
+                                      frame=random.randint(0, 7)))
+        game.sparks.extend(sparks)
+        game.particles.extend(particles)
@@ -6,12 +6,63 @@ import pygame.font
 
 from scripts.particle import Particle
 from scripts.spark import Spark
+from scripts.effects import Effects
 from scripts.settings import settings
 from scripts.collectableManager import CollectableManager as cm
-import math
+
+
+# Enemy walk and bullet speeds grow with the level; settings.selected_level
+# only changes between levels, so the game looks them up once per tick
+_enemy_speeds_cache = {}
+
+def enemy_speeds(level):
+    speeds = _enemy_speeds_cache.get(level)
+    if speeds is None:
+        scale = math.log1p(level)
+        speeds = (0.35 * (1 + 0.8 * scale), 1.15 * (1 + 0.59 * scale))
+        _enemy_speeds_cache[level] = speeds
+    return speeds
+
+# Idle enemies used to roll a 1% chance to start walking every frame.
+# Draw the number of failed rolls up front instead (geometric distribution)
+_LOG_IDLE_STAY = math.log(0.99)
+
+def _idle_frames():
+    return int(math.log(1.0 - random.random()) / _LOG_IDLE_STAY)
+
+# Mirrored copies of sprite frames, made once per image instead of
+# every frame an entity faces left. The cache lives on the game next to
+# its assets, so it goes away with the surfaces it is keyed by
+def _mirror(mirrored, img):
+    flipped = mirrored.get(img)
+    if flipped is None:
+        flipped = pygame.transform.flip(img, True, False)
+        mirrored[img] = flipped
+    return flipped
+
+
+# Asset keys like 'player/red/run', joined once per combination
+_asset_keys = {}
+
+def _asset_key(e_type, skin, action):
+    key = _asset_keys.get((e_type, skin, action))
+    if key is None:
+        if skin is None:
+            key = e_type + '/' + action
+        else:
+            key = e_type + '/' + cm.SKIN_PATHS[skin] + '/' + action
+        _asset_keys[(e_type, skin, action)] = key
+    return key
 
 
 class PhysicsEntity:
+    __slots__ = ('game', 'type', 'pos', 'size', 'id', 'velocity',
+                 'collide_up', 'collide_down', 'collide_left', 'collide_right',
+                 'alive', 'action', 'anim_offset', 'flip', 'animation', 'last_movement')
+
+    # Only players pick a skin
+    skin = None
+
     def __init__(self, game, e_type, pos, size, id):
         self.game = game
         self.type = e_type
@@ -19,7 +70,9 @@ class PhysicsEntity:
         self.size = size
         self.id = id
         self.velocity = [0, 0]
-        self.collisions = {'up': False, 'down': False, 'right': False, 'left': False}
+        # Which sides touched a solid tile in the last update
+        self.collide_up = self.collide_down = False
+        self.collide_left = self.collide_right = False
         
         self.alive = True
         self.action = ''
@@ -35,40 +88,53 @@ class PhysicsEntity:
     def set_action(self, action):
         if action != self.action:
             self.action = action
-            if self.type == 'enemy':
-                self.animation = self.game.assets[self.type + '/' + self.action].copy()
-            if self.type == 'player':
-                self.animation = self.game.assets[self.type + '/' + cm.SKIN_PATHS[self.skin] + '/' + self.action].copy()
+            self.animation = self.game.assets[_asset_key(self.type, self.skin, action)].copy()
         
     def update(self, tilemap, movement=(0, 0)):
-        self.collisions = {'up': False, 'down': False, 'right': False, 'left': False}
+        # Runs for every entity every frame: keep the step in locals
+        pos = self.pos
+        collide_up = collide_down = collide_left = collide_right = False
+        size_w, size_h = self.size
+        move_x = movement[0] + self.velocity[0]
+        move_y = movement[1] + self.velocity[1]
         
-        frame_movement = (movement[0] + self.velocity[0], movement[1] + self.velocity[1])
-        
-        self.pos[0] += frame_movement[0]
-        entity_rect = self.rect()
-        for rect in tilemap.physics_rects_around(self.pos):
+        # collidelistall picks the touching tiles in one call; each is tested
+        # again since snapping to an earlier one can clear a later one
+        pos[0] += move_x
+        entity_rect = pygame.Rect(pos[0], pos[1], size_w, size_h)
+        tile_size = tilemap.tile_size
+        tile_loc = (int(pos[0] // tile_size), int(pos[1] // tile_size))
+        rects = tilemap.physics_rects_around(pos)
+        for i in entity_rect.collidelistall(rects):
+            rect = rects[i]
             if entity_rect.colliderect(rect):
-                if frame_movement[0] > 0:
+                if move_x > 0:
                     entity_rect.right = rect.left
-                    self.collisions['right'] = True
-                if frame_movement[0] < 0:
+                    collide_right = True
+                if move_x < 0:
                     entity_rect.left = rect.right
-                    self.collisions['left'] = True
-                self.pos[0] = entity_rect.x
+                    collide_left = True
+                pos[0] = entity_rect.x
         
-        self.pos[1] += frame_movement[1]
-        entity_rect = self.rect()
-        for rect in tilemap.physics_rects_around(self.pos):
+        pos[1] += move_y
+        entity_rect = pygame.Rect(pos[0], pos[1], size_w, size_h)
+        # The neighbourhood only changes if we ended up in another tile
+        if (int(pos[0] // tile_size), int(pos[1] // tile_size)) != tile_loc:
+            rects = tilemap.physics_rects_around(pos)
+        for i in entity_rect.collidelistall(rects):
+            rect = rects[i]
             if entity_rect.colliderect(rect):
-                if frame_movement[1] > 0:
+                if move_y > 0:
                     entity_rect.bottom = rect.top
-                    self.collisions['down'] = True
-                if frame_movement[1] < 0:
+                    collide_down = True
+                if move_y < 0:
                     entity_rect.top = rect.bottom
-                    self.collisions['up'] = True
-                self.pos[1] = entity_rect.y
-                
+                    collide_up = True
+                pos[1] = entity_rect.y
+        
+        self.collide_up, self.collide_down = collide_up, collide_down
+        self.collide_left, self.collide_right = collide_left, collide_right
+        
         if movement[0] > 0:
             self.flip = False
         if movement[0] < 0:
@@ -78,60 +144,61 @@ class PhysicsEntity:
         
         self.velocity[1] = min(5, self.velocity[1] + 0.1)
         
-        if self.collisions['down'] or self.collisions['up']:
+        if collide_down or collide_up:
             self.velocity[1] = 0
             
         self.animation.update()
         
     def render(self, surf, offset=(0, 0)):
-        surf.blit(pygame.transform.flip(
-            self.animation.img(), 
-            self.flip, False), 
+        img = self.animation.img()
+        surf.blit(_mirror(self.game.mirrored, img) if self.flip else img, 
             (self.pos[0] - offset[0] + self.anim_offset[0], 
              self.pos[1] - offset[1] + self.anim_offset[1]))
         
 class Enemy(PhysicsEntity):
+    __slots__ = ('walking', 'idle', '_half_w', '_half_h')
+
     def __init__(self, game, pos, size=(15, 8), id=0):
         super().__init__(game, 'enemy', pos, size, id)
         self.walking = 0
+        self.idle = _idle_frames()
+        # rect() builds a new Rect each call; the centre is all update and
+        # render need, and it is this offset from the truncated position
+        self._half_w = self.size[0] // 2
+        self._half_h = self.size[1] // 2
         
     def update(self, tilemap, movement=(0, 0)):
         if self.walking:
-            if tilemap.solid_check((self.rect().centerx + (-7 if self.flip else 7), self.pos[1] + 23)):
-                if (self.collisions['right'] or self.collisions['left']):
+            # -1 facing left, 1 facing right
+            sign = 1 - 2 * self.flip
+            if tilemap.solid_check((int(self.pos[0]) + self._half_w + 7 * sign, self.pos[1] + 23)):
+                if (self.collide_right or self.collide_left):
                     self.flip = not self.flip
                 else:
-                    direction = 0.35 * (1 + 0.8 * math.log(settings.selected_level + 1))
-                    movement = (movement[0] - direction if self.flip else direction, movement[1])
+                    movement = (movement[0] + self.game.enemy_speeds[0] * sign, movement[1])
             else:
                 self.flip = not self.flip
             self.walking = max(0, self.walking - 1)
             if not self.walking:
-                dis = (self.game.player.pos[0] - self.pos[0], 
-                       self.game.player.pos[1] - self.pos[1])
-                if (abs(dis[1]) < 15):
-                    if (self.flip and dis[0] < 0):
-                        self.game.sfx['shoot'].play()
-                        direction = -1.15 * (1 + 0.59 * math.log(settings.selected_level + 1))
-                        self.game.projectiles.append([[self.rect().centerx - 15, 
-                                                       self.rect().centery], direction, 0])
-                        for i in range(4):
-                            self.game.sparks.append(
-                                Spark(self.game.projectiles[-1][0], 
-                                      random.random() - 0.5 + math.pi, 
-                                      2 + random.random()))
-                        
-                    if (not self.flip and dis[0] > 0):
-                        self.game.sfx['shoot'].play()
-                        direction = 1.15 * (1 + 0.59 * math.log(settings.selected_level + 1))
-                        self.game.projectiles.append([[self.rect().centerx + 15, 
-                                                       self.rect().centery], direction, 0])
-                        for i in range(4):
-                            self.game.sparks.append(
-                                Spark(self.game.projectiles[-1][0], 
-                                      random.random() - 0.5, 
-                                      2 + random.random()))
-        elif random.random() < 0.01:
+                self.idle = _idle_frames()
+                player_pos = self.game.player.pos
+                dx = player_pos[0] - self.pos[0]
+                dy = player_pos[1] - self.pos[1]
+                # Shoot if the player is level with us and on the side we face
+                sign = 1 - 2 * self.flip
+                if -15 < dy < 15 and dx * sign > 0:
+                    self.game.sfx['shoot'].play()
+                    rect = self.rect()
+                    self.game.projectiles.append([[rect.centerx + 15 * sign, 
+                                                   rect.centery], self.game.enemy_speeds[1] * sign, 0])
+                    for i in range(4):
+                        self.game.sparks.append(
+                            Spark(self.game.projectiles[-1][0], 
+                                  random.random() - 0.5 + math.pi * self.flip, 
+                                  2 + random.random()))
+        elif self.idle:
+            self.idle -= 1
+        else:
             self.walking = random.randint(30, 120)
         
         super().update(tilemap, movement=movement)
@@ -140,57 +207,43 @@ class Enemy(PhysicsEntity):
         else:
             self.set_action('idle')
             
-        if abs(self.game.player.dashing) >= 50:
-            if self.rect().colliderect(self.game.player.rect()):
-                self.game.screenshake = max(16, self.game.screenshake)
-                self.game.sfx['hit'].play()
-                self.game.cm.coins += 1
-                for i in range(30):
-                    angle = random.random() * math.pi * 2
-                    speed = random.random() * 5
-                    self.game.sparks.append(
-                        Spark(self.rect().center, angle, 2 + random.random()))
-                    self.game.particles.append(
-                        Particle(self.game, 'particle', self.rect().center, 
-                                 velocity=[math.cos(angle + math.pi) * speed * 0.5, 
-                                           math.sin(angle + math.pi) * speed * 0.5], 
-                                 frame=random.randint(0, 7)))
-                self.game.sparks.append(Spark(self.rect().center, 0, 5 + random.random()))
-                self.game.sparks.append(Spark(self.rect().center, math.pi, 5 + random.random()))
-                return True
-            
-        rect = pygame.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
-        for projectile in self.game.projectiles.copy():
-            projectile_rect = pygame.Rect(projectile[0][0], projectile[0][1], 4, 4)
-            if rect.colliderect(projectile_rect):
-                self.game.projectiles.remove(projectile)
-                self.game.screenshake = max(16, self.game.screenshake)
-                self.game.sfx['hit'].play()
-                self.game.cm.coins += 1
-                for i in range(30):
-                    angle = random.random() * math.pi * 2
-                    speed = random.random() * 5
-                    self.game.sparks.append(Spark(self.rect().center, angle, 2 + random.random()))
-                    self.game.particles.append(Particle(
-                        self.game, 'particle', self.rect().center,
-                        velocity=[math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5],
-                        frame=random.randint(0, 7)))
+        # Bullets are tested for all enemies at once by the caller; here
+        # only a dashing player can kill us
+        if self.game.dash_active:
+            rect = self.rect()
+            if rect.colliderect(self.game.player_rect):
+                center = rect.center
+                self.die(center)
+                self.game.sparks.append(Spark(center, 0, 5 + random.random()))
+                self.game.sparks.append(Spark(center, math.pi, 5 + random.random()))
                 return True
+        return False
+
+    def die(self, center):
+        self.game.screenshake = max(16, self.game.screenshake)
+        self.game.sfx['hit'].play()
+        self.game.cm.coins += 1
+        Effects.hit_burst(self.game, center)
 
 
     def render(self, surf, offset=(0, 0)):
         super().render(surf, offset=offset)
         
+        centerx = int(self.pos[0]) + self._half_w
+        centery = int(self.pos[1]) + self._half_h
         if self.flip:
-            surf.blit(pygame.transform.flip(self.game.assets['gun'], True, False), 
-                      (self.rect().centerx - 4 - self.game.assets['gun'].get_width() - offset[0], 
-                       self.rect().centery - offset[1]))
+            surf.blit(_mirror(self.game.mirrored, self.game.assets['gun']), 
+                      (centerx - 4 - self.game.assets['gun'].get_width() - offset[0], 
+                       centery - offset[1]))
         else:
             surf.blit(self.game.assets['gun'], 
-                      (self.rect().centerx + 4 - offset[0], 
-                       self.rect().centery - offset[1]))
+                      (centerx + 4 - offset[0], 
+                       centery - offset[1]))
 
 class Player(PhysicsEntity):
+    __slots__ = ('skin', 'air_time', 'jumps', 'wall_slide', 'dashing', 'lifes',
+                 'respawn_pos', 'shoot_cooldown')
+
     def __init__(self, game, pos, size, id, lifes, respawn_pos):
         self.skin = 0
         super().__init__(game, 'player', pos, size, id)
@@ -207,9 +260,10 @@ class Player(PhysicsEntity):
         if self.game.cm.gun and self.game.cm.ammo > 0 and self.shoot_cooldown == 0 and settings.selected_weapon == 1:
             self.game.sfx['shoot'].play()
             direction = -3.5 if self.flip else 3.5
+            rect = self.rect()
             self.game.projectiles.append([
-                [self.rect().centerx + (7 * (-1 if self.flip else 1)), 
-                 self.rect().centery], 
+                [rect.centerx + (7 * (-1 if self.flip else 1)), 
+                 rect.centery], 
                 direction, 
                 0
             ])
@@ -234,15 +288,15 @@ class Player(PhysicsEntity):
                 self.game.screenshake = max(16, self.game.screenshake)
             self.game.dead += 1
 
-        if self.collisions['down']:
+        if self.collide_down:
             self.air_time = 0
             self.jumps = 1
             
         self.wall_slide = False
-        if (self.collisions['right'] or self.collisions['left']) and self.air_time > 4:
+        if (self.collide_right or self.collide_left) and self.air_time > 4:
             self.wall_slide = True
             self.velocity[1] = min(self.velocity[1], 0.5)
-            if self.collisions['right']:
+            if self.collide_right:
                 self.flip = False
             else:
                 self.flip = True
@@ -256,31 +310,40 @@ class Player(PhysicsEntity):
             else:
                 self.set_action('idle')
         
-        if abs(self.dashing) in {60, 50}:
+        dash = abs(self.dashing)
+        if dash == 60 or dash == 50:
+            center = self.rect().center
             for i in range(20):
                 angle = random.random() * math.pi * 2
                 speed = random.random() * 0.5 + 0.5
                 pvelocity = [math.cos(angle) * speed, math.sin(angle) * speed]
                 self.game.particles.append(
-                    Particle(self.game, 'particle', self.rect().center, 
+                    Particle(self.game, 'particle', center, 
                              velocity=pvelocity, frame=random.randint(0, 7)))
+        # Count the dash down towards zero
         if self.dashing > 0:
-            self.dashing = max(0, self.dashing - 1)
-        if self.dashing < 0:
-            self.dashing = min(0, self.dashing + 1)
-        if abs(self.dashing) > 50:
-            self.velocity[0] = abs(self.dashing) / self.dashing * 8
-            if abs(self.dashing) == 51:
+            self.dashing -= 1
+        elif self.dashing < 0:
+            self.dashing += 1
+        dash = abs(self.dashing)
+        if dash > 50:
+            direction = 1.0 if self.dashing > 0 else -1.0
+            self.velocity[0] = direction * 8
+            if dash == 51:
                 self.velocity[0] *= 0.1
-            pvelocity = [abs(self.dashing) / self.dashing * random.random() * 3, 0]
+            pvelocity = [direction * random.random() * 3, 0]
             self.game.particles.append(
                 Particle(self.game, 'particle', self.rect().center, 
                          velocity=pvelocity, frame=random.randint(0, 7)))
                 
-        if self.velocity[0] > 0:
-            self.velocity[0] = max(self.velocity[0] - 0.1, 0)
+        # Friction: 0.1 per frame towards zero, stopping at zero
+        vx = self.velocity[0]
+        if vx > 0.1:
+            self.velocity[0] = vx - 0.1
+        elif vx < -0.1:
+            self.velocity[0] = vx + 0.1
         else:
-            self.velocity[0] = min(self.velocity[0] + 0.1, 0)
+            self.velocity[0] = 0
     
     def render(self, surf, offset=(0, 0)):
         if abs(self.dashing) <= 50:
@@ -288,7 +351,7 @@ class Player(PhysicsEntity):
 
         if self.game.cm.gun and settings.selected_weapon == 1:
             if self.flip:
-                surf.blit(pygame.transform.flip(self.game.assets['gun'], True, False), 
+                surf.blit(_mirror(self.game.mirrored, self.game.assets['gun']), 
                         (self.rect().centerx - 4 - self.game.assets['gun'].get_width() - offset[0], 
                         self.rect().centery - offset[1]))
             else:
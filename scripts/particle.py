@@ -1,4 +1,7 @@
 class Particle:
+    # Spawned dozens at a time; no per-instance dict
+    __slots__ = ('game', 'type', 'pos', 'velocity', 'animation')
+
     def __init__(self, game, p_type, pos, velocity=[0, 0], frame=0):
         self.game = game
         self.type = p_type
@@ -35,8 +35,11 @@ class Settings:
 
     @music_volume.setter
     def music_volume(self, value):
-        self._music_volume = max(0.0, max(0.0, min(1.0, round(value * 10) / 10)))
-        self.save_settings()
+        value = max(0.0, max(0.0, min(1.0, round(value * 10) / 10)))
+        # Holding a key at either end of the slider keeps setting the same value
+        if value != self._music_volume:
+            self._music_volume = value
+            self.save_settings()
 
     @property
     def sound_volume(self):
@@ -44,8 +47,10 @@ class Settings:
 
     @sound_volume.setter
     def sound_volume(self, value):
-        self._sound_volume = max(0.0, max(0.0, min(1.0, round(value * 10) / 10)))
-        self.save_settings()
+        value = max(0.0, max(0.0, min(1.0, round(value * 10) / 10)))
+        if value != self._sound_volume:
+            self._sound_volume = value
+            self.save_settings()
 
     @property
     def selected_level(self):
@@ -53,8 +58,10 @@ class Settings:
 
     @selected_level.setter
     def selected_level(self, value):
-        self._selected_level = max(0, value)
-        self.save_settings()
+        value = max(0, value)
+        if value != self._selected_level:
+            self._selected_level = value
+            self.save_settings()
 
     def set_editor_level(self, value):
         self.selected_editor_level = max(0, value)
@@ -2,6 +2,8 @@ import math
 import pygame
 
 class Spark:
+    __slots__ = ('pos', 'angle', 'speed')
+
     def __init__(self, pos, angle, speed):
         self.pos = list(pos)
         self.angle = angle
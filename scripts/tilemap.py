@@ -34,6 +34,8 @@ class Tilemap:
         self.enemies = []
         self.players = []
         self.meta_data = {}
+        # Solid rects around each tile, filled in as entities visit
+        self._physics_rects = {}
 
         self.save_dir = 'data/saves'
         if not os.path.exists(self.save_dir):
@@ -56,6 +58,7 @@ class Tilemap:
                 matches[-1]['pos'][1] *= self.tile_size
                 if not keep:
                     del self.tilemap[loc]
+                    self._physics_rects = {}
         
         return matches
 
@@ -132,6 +135,7 @@ class Tilemap:
             self.tilemap = map_data['tilemap']
             self.tile_size = map_data['tile_size']
             self.offgrid_tiles = map_data['offgrid']
+            self._physics_rects = {}
 
             self.players = []
             self.enemies = []
@@ -168,13 +172,19 @@ class Tilemap:
                 return self.tilemap[tile_loc]
 
     def physics_rects_around(self, pos):
-        rects = []
-        for tile in self.tiles_around(pos):
-            if tile['type'] in PHYSICS_TILES:
-                rects.append(pygame.Rect(tile['pos'][0] * self.tile_size, 
-                                         tile['pos'][1] * self.tile_size,
-                                         self.tile_size, 
-                                         self.tile_size))
+        # The answer only depends on the tile pos is in, and every entity
+        # asks every frame; the returned list is shared, don't modify it
+        tile_loc = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+        rects = self._physics_rects.get(tile_loc)
+        if rects is None:
+            rects = []
+            for tile in self.tiles_around(pos):
+                if tile['type'] in PHYSICS_TILES:
+                    rects.append(pygame.Rect(tile['pos'][0] * self.tile_size, 
+                                             tile['pos'][1] * self.tile_size,
+                                             self.tile_size, 
+                                             self.tile_size))
+            self._physics_rects[tile_loc] = rects
         return rects
 
     def autotile(self):
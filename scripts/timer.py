@@ -9,7 +9,6 @@ BEST_TIMES_FILE = "data/best_times.json"
 class Timer:
     def __init__(self, level):
         self.current_level = str(level)
-        self.font = pygame.font.Font(None, 36)
         self.start_time = pygame.time.get_ticks()
         self.current_time = 0
         self.elapsed_time = 0
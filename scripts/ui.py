@@ -1,11 +1,15 @@
 import pygame
+import functools
 import math
 import random
 from scripts.particle import Particle
 from scripts.spark import Spark
-from scripts.button import Button
+from scripts.effects import Effects
 from scripts.settings import Settings
 
+# fblits (pygame-ce) skips building the list of result rects
+_HAS_FBLITS = hasattr(pygame.Surface, "fblits")
+
 class UI:
 
     COLOR = "#137547"
@@ -14,22 +18,22 @@ class UI:
     SELECTOR_COLOR = "#DD6E42"
     #LOCK_IMG = pygame.image.load("data/images/gun.png")
 
+    _fonts = {}
+
     @staticmethod
     def get_font(size):
-        return pygame.font.Font("data/font.ttf", size)
+        # Opening the TTF is slow, keep one Font per size
+        font = UI._fonts.get(size)
+        if font is None:
+            font = UI._fonts[size] = pygame.font.Font("data/font.ttf", size)
+        return font
 
     @staticmethod
-    def draw_text_with_outline(surface, font, text, x, y,
-                               text_color=(255,255,255),
-                               outline_color=(0,0,0),
-                               center=False,
-                               scale=1):
-
+    def render_outlined_text(font, text, text_color, outline_color=(0,0,0), scale=1):
         text_surf = font.render(text, True, text_color)
-
-        if center:
-            text_rect = text_surf.get_rect(center=(x, y))
-            x, y = text_rect.x, text_rect.y
+        outline_surf = font.render(text, True, outline_color)
+        w, h = text_surf.get_size()
+        surf = pygame.Surface((w + 2 * scale, h + 2 * scale), pygame.SRCALPHA)
 
         offsets = [
             (-1*scale, -1*scale), (-1*scale, 0), (-1*scale, 1*scale),
@@ -37,10 +41,58 @@ class UI:
             (1*scale,  -1*scale),  (1*scale,  0),  (1*scale,  1*scale)
         ]
         for ox, oy in offsets:
-            outline_surf = font.render(text, True, outline_color)
-            surface.blit(outline_surf, (x + ox, y + oy))
+            surf.blit(outline_surf, (scale + ox, scale + oy))
+
+        surf.blit(text_surf, (scale, scale))
+        return surf
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def get_outlined_text(size, text, text_color, outline_color=(0,0,0), scale=1):
+        # Menu and HUD labels repeat every frame, rasterize each one once
+        return UI.render_outlined_text(UI.get_font(size), text, text_color, outline_color, scale)
+
+    @staticmethod
+    def draw_cached_text(surface, size, text, x, y,
+                         text_color=(255,255,255),
+                         outline_color=(0,0,0),
+                         center=False,
+                         scale=1,
+                         align='left'):
 
-        surface.blit(text_surf, (x, y))
+        surf = UI.get_outlined_text(size, text, text_color, outline_color, scale)
+        if center:
+            rect = surf.get_rect(center=(x, y))
+        elif align == 'right':
+            rect = surf.get_rect(topright=(x + scale, y - scale))
+        else:
+            rect = surf.get_rect(topleft=(x - scale, y - scale))
+        return surface.blit(surf, rect)
+
+    @staticmethod
+    def build_option_blits(font, items, selected, x, y, spacing, color_sel, color_base, cache_dict):
+        # One (surface, rect) pair per visible option, memoized per selection
+        # so steady-state frames reuse the same list for a single blits() call
+        key = (tuple(items), selected)
+        blits = cache_dict.get(key)
+        if blits is None:
+            blits = []
+            for i, item in enumerate(items):
+                color = color_sel if i == selected else color_base
+                surf = UI.render_outlined_text(font, f"{item}", color, scale=3)
+                blits.append((surf, surf.get_rect(center=(x, y + i * spacing))))
+            cache_dict[key] = blits
+        return blits
+
+    @staticmethod
+    def draw_blits(surface, blits):
+        # One C call for the whole (surface, rect) sequence; the rects are
+        # already at hand, so hand them back for dirty-rect updates
+        if _HAS_FBLITS:
+            surface.fblits(blits)
+        else:
+            surface.blits(blits, doreturn=False)
+        return [rect for _, rect in blits]
 
     @staticmethod
     def render_game_elements(game, render_scroll):
@@ -62,6 +114,19 @@ class UI:
             if kill:
                 game.enemies.remove(enemy)
 
+        # Bullets against enemies, once everyone has moved: each enemy takes
+        # the first bullet that touches it
+        if game.projectiles and game.enemies:
+            projectile_rects = [pygame.Rect(p[0][0], p[0][1], 4, 4) for p in game.projectiles]
+            for enemy in game.enemies.copy():
+                rect = enemy.rect()
+                i = rect.collidelist(projectile_rects)
+                if i != -1:
+                    del game.projectiles[i]
+                    del projectile_rects[i]
+                    enemy.die(rect.center)
+                    game.enemies.remove(enemy)
+
         if not game.dead:
             for player in game.players:
                 if player.id == game.playerID:
@@ -70,6 +135,7 @@ class UI:
                     player.update(game.tilemap, (0, 0)) 
                 if player.lifes > 0:
                     player.render(game.display, offset=render_scroll)
+            game.player_rect = game.player.rect()
 
         # Projectiles
         for projectile in game.projectiles.copy():
@@ -90,28 +156,21 @@ class UI:
                         player.lifes -= 1
                         game.sfx['hit'].play()
                         game.screenshake = max(16, game.screenshake)
-                        for i in range(30):
-                            angle = random.random() * math.pi * 2
-                            speed = random.random() * 5
-                            game.sparks.append(Spark(player.rect().center, angle, 2 + random.random()))
-                            game.particles.append(Particle(
-                                game, 'particle', player.rect().center,
-                                velocity=[
-                                    math.cos(angle + math.pi) * speed * 0.5,
-                                    math.sin(angle + math.pi) * speed * 0.5
-                                ],
-                                frame=random.randint(0, 7)
-                            ))
+                        Effects.hit_burst(game, player.rect().center)
 
         # Sparks
-        for spark in game.sparks.copy():
+        # Keep the live ones in a new list rather than copying the old one
+        # and removing the dead one by one
+        sparks = []
+        for spark in game.sparks:
             kill = spark.update()
             spark.render(game.display, offset=render_scroll)
-            if kill:
-                game.sparks.remove(spark)
+            if not kill:
+                sparks.append(spark)
+        game.sparks = sparks
         
         # Collectables update & render
-        game.cm.update(game.player.rect())
+        game.cm.update(game.player_rect)
         game.cm.render(game.display, offset=render_scroll)
 
         # Display sillhouette
@@ -121,47 +180,22 @@ class UI:
             game.display_2.blit(display_sillhouette, offset_o)
 
         # Particles
-        for particle in game.particles.copy():
+        particles = []
+        for particle in game.particles:
             kill = particle.update()
             particle.render(game.display, offset=render_scroll)
             if particle.type == 'leaf':
                 particle.pos[0] += math.sin(particle.animation.frame * 0.035) * 0.3
-            if kill:
-                game.particles.remove(particle)
+            if not kill:
+                particles.append(particle)
+        game.particles = particles
             
-    @staticmethod
-    def render_o_box(screen, options, selected_option, x, y, spacing, font_size=30):
-        
-        option_rects = []
-        font = UI.get_font(font_size)
-
-        for i, option in enumerate(options):
-            if i == selected_option:
-                button_color = UI.SELECTOR_COLOR
-            else:
-                button_color = UI.PM_COLOR
-            
-            button_text = f"{option}"
-            UI.draw_text_with_outline(
-                surface=screen,
-                font=font,
-                text=button_text,
-                x=x,
-                y=y + i * spacing,
-                text_color=button_color,
-                center=True,
-                scale=3
-            )
-
-        return option_rects
-
     @staticmethod
     def render_info_box(screen, info, y, spacing):
-        font_15 = UI.get_font(15)
         for i, text in enumerate(info):
-            UI.draw_text_with_outline(
+            UI.draw_cached_text(
                 surface=screen,
-                font=font_15,
+                size=15,
                 text=text,
                 x=320,
                 y=y + i * spacing,
@@ -172,10 +206,9 @@ class UI:
     
     @staticmethod
     def render_menu_title(screen, title, x, y):
-        font = UI.get_font(50)
-        UI.draw_text_with_outline(
+        return UI.draw_cached_text(
             surface=screen,
-            font=font,
+            size=50,
             text=title,
             x=x,
             y=y,
@@ -186,10 +219,9 @@ class UI:
 
     @staticmethod
     def render_menu_subtitle(screen, subtitle, x, y):
-        font = UI.get_font(40)
-        UI.draw_text_with_outline(
+        return UI.draw_cached_text(
             surface=screen,
-            font=font,
+            size=40,
             text=subtitle,
             x=x,
             y=y,
@@ -198,18 +230,11 @@ class UI:
             scale=3
         )
 
-    @staticmethod
-    def render_menu_bg(screen, display, bg):
-        display.blit(bg, (0, 0))
-        scaled_display = pygame.transform.scale(display, screen.get_size())
-        screen.blit(scaled_display, (0, 0))
-
     @staticmethod
     def render_menu_msg(screen, msg, x, y):
-        font_15 = UI.get_font(30)
-        UI.draw_text_with_outline(
+        return UI.draw_cached_text(
             surface=screen,
-            font=font_15,
+            size=30,
             text=msg,
             x=x,
             y=y,
@@ -220,33 +245,27 @@ class UI:
     
     @staticmethod
     def render_menu_ui_element(display, text, x, y, align='left'):
-        font = UI.get_font(15)
-        if align == 'right':
-            text_surface = font.render(text, True, UI.GAME_UI_COLOR)
-            x = x - text_surface.get_width()
-        UI.draw_text_with_outline(
+        return UI.draw_cached_text(
             surface=display,
-            font=font,
+            size=15,
             text=text,
             x=x,
             y=y,
             text_color=UI.GAME_UI_COLOR,
-            scale=2
+            scale=2,
+            align=align
         )
 
     @staticmethod
     def render_game_ui_element(display, text, x, y, align='left'):
-        font = UI.get_font(8)
-        if align == 'right':
-            text_surface = font.render(text, True, UI.GAME_UI_COLOR)
-            x = x - text_surface.get_width()
-        UI.draw_text_with_outline(
+        UI.draw_cached_text(
             surface=display,
-            font=font,
+            size=8,
             text=text,
             x=x,
             y=y,
             text_color=UI.GAME_UI_COLOR,
+            align=align
         )
 
     @staticmethod
@@ -260,17 +279,17 @@ class UI:
             (0*scale,  -1*scale),                 (0*scale,  1*scale),
             (1*scale,  -1*scale),  (1*scale,  0),  (1*scale,  1*scale)
         ]
-        for ox, oy in offsets:
-            surface.blit(outline_surf, (x + ox, y + oy))
-
-        surface.blit(img, (x, y))
+        rects = [surface.blit(outline_surf, (x + ox, y + oy)) for ox, oy in offsets]
+        return surface.blit(img, (x, y)).unionall(rects)
     
     @staticmethod
-    def render_ui_img(display, p, x, y, scale=1):
-        img = pygame.image.load(p)
-        img = pygame.transform.scale(img, (int(img.get_width() * scale), int(img.get_height() * scale)))
-        display.blit(img, (x - img.get_width() / 2, y - img.get_height() / 2))
-        UI.draw_img_outline(display, img, x - img.get_width() / 2, y - img.get_height() / 2)
+    def load_ui_img(p, scale=1):
+        img = pygame.image.load(p).convert_alpha()
+        return pygame.transform.scale(img, (int(img.get_width() * scale), int(img.get_height() * scale)))
+
+    @staticmethod
+    def render_ui_surface(display, img, x, y):
+        return UI.draw_img_outline(display, img, x - img.get_width() / 2, y - img.get_height() / 2)
 
 
     
\ No newline at end of file
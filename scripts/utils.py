@@ -14,6 +14,11 @@ def load_images(path):
         images.append(load_image(path + '/' + img_name))
     return images
 
+def list_levels(path='data/maps'):
+    # Level ids of all map files, sorted; scandir avoids the extra stat calls
+    with os.scandir(path) as entries:
+        return sorted(int(e.name[:-5]) for e in entries if e.name.endswith('.json'))
+
 
 class Animation:
     def __init__(self, images, img_dur=5, loop=True):